@@ -0,0 +1,205 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """
+    LRU cache of chatbot answers keyed by query embedding.
+
+    A lookup returns the cached answer of the most similar previous question when
+    its cosine similarity is at least the threshold, so rephrased repeats skip
+    retrieval and the LLM call.
+
+    Args:
+        threshold (float): Minimum cosine similarity for a hit (0-1).
+        max_entries (int): Number of answers kept before the least recently used is evicted.
+        fingerprint (str, optional): Identifies the index the answers were produced from.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 128, fingerprint: str | None = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self._entries = OrderedDict()  # key -> (unit vector, answer)
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, query_vector, fingerprint: str | None = None):
+        """
+        Looks up the answer of the most similar cached question.
+
+        Args:
+            query_vector (list[float]): Embedding of the new question.
+            fingerprint (str, optional): Index the caller answers from; a mismatch
+                with the cache's fingerprint is always a miss.
+
+        Returns:
+            The cached answer, or None on a miss.
+        """
+        query = self._normalize(query_vector)
+        with self._lock:
+            if self._entries and (fingerprint is None or fingerprint == self.fingerprint):
+                keys = list(self._entries)
+                matrix = np.stack([self._entries[k][0] for k in keys])
+                scores = matrix @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self._entries.move_to_end(keys[best])
+                    self.hits += 1
+                    return self._entries[keys[best]][1]
+            self.misses += 1
+            return None
+
+    def put(self, query_vector, answer, fingerprint: str | None = None):
+        """
+        Caches an answer, evicting the least recently used one when full. Answers
+        produced from another index than the cache's fingerprint are not stored.
+        """
+        with self._lock:
+            if fingerprint is not None and fingerprint != self.fingerprint:
+                return
+            self._entries[self._next_key] = (self._normalize(query_vector), answer)
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, fingerprint: str | None = None):
+        """Drops every cached answer, e.g. because the index was rebuilt."""
+        with self._lock:
+            self._invalidate(fingerprint)
+
+    def _invalidate(self, fingerprint):
+        self._entries.clear()
+        self.fingerprint = fingerprint
+        self.invalidations += 1
+
+    def ensure_fingerprint(self, fingerprint: str):
+        """Invalidates the cache if it was built for a different index."""
+        with self._lock:
+            if self.fingerprint != fingerprint:
+                self._invalidate(fingerprint)
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def index_fingerprint(texts, model_name: str) -> str:
+    """
+    Computes a fingerprint of the chunks and embedding model an index was built from.
+
+    Args:
+        texts (list[str]): Chunks added to the vector store.
+        model_name (str): Embedding model name.
+
+    Returns:
+        str: Hex digest that changes whenever the index contents would change.
+    """
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for text in texts:
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# One cache per video, shared across Streamlit sessions
+_caches = OrderedDict()
+_caches_lock = threading.Lock()
+MAX_CACHED_VIDEOS = 32
+
+
+def get_answer_cache(video_id: str, fingerprint: str, threshold: float = 0.92,
+                     max_entries: int = 128) -> SemanticAnswerCache:
+    """
+    Returns the answer cache of a video, invalidating it if the index changed.
+
+    Args:
+        video_id (str): YouTube video ID.
+        fingerprint (str): Fingerprint of the current index (see index_fingerprint).
+        threshold (float): Cosine-similarity threshold for new caches.
+        max_entries (int): LRU size for new caches.
+
+    Returns:
+        SemanticAnswerCache: The cache for this video.
+    """
+    with _caches_lock:
+        cache = _caches.get(video_id)
+        if cache is None:
+            cache = SemanticAnswerCache(threshold, max_entries, fingerprint)
+            _caches[video_id] = cache
+            while len(_caches) > MAX_CACHED_VIDEOS:
+                _caches.popitem(last=False)
+        _caches.move_to_end(video_id)
+
+    cache.ensure_fingerprint(fingerprint)
+    return cache
+
+
+class CachedRetrievalQA:
+    """
+    Wraps a RetrievalQA chain so repeated (or reworded) questions are answered
+    from a SemanticAnswerCache. Exposes the same invoke({"query": ...}) interface.
+
+    The question is embedded once: the same vector is used for the cache lookup
+    and, on a miss, for the similarity search. Reads and writes carry the
+    fingerprint of this chain's index, so a chain left over from before the cache
+    was invalidated (e.g. in another Streamlit session) neither reads nor stores
+    answers for the new index.
+
+    Args:
+        qa_chain: The RetrievalQA chain whose documents chain answers misses.
+        embeddings: Embedding model with an embed_query method.
+        vectorstore: Vector store the chain retrieves from.
+        cache (SemanticAnswerCache): Cache to read from and fill.
+        fingerprint (str): Fingerprint of the index behind vectorstore.
+        k (int): Number of documents to retrieve on a miss.
+    """
+
+    def __init__(self, qa_chain, embeddings, vectorstore, cache: SemanticAnswerCache,
+                 fingerprint: str, k: int = 4):
+        self.qa_chain = qa_chain
+        self.embeddings = embeddings
+        self.vectorstore = vectorstore
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.k = k
+
+    def invoke(self, inputs: dict, **kwargs) -> dict:
+        query = inputs["query"]
+        query_vector = self.embeddings.embed_query(query)
+        cached = self.cache.get(query_vector, self.fingerprint)
+        if cached is not None:
+            return {"query": query, **cached}
+
+        docs = self.vectorstore.similarity_search_by_vector(query_vector, k=self.k)
+        combine_chain = self.qa_chain.combine_documents_chain
+        output = combine_chain.invoke({"input_documents": docs, "question": query}, **kwargs)
+        answer = {"result": output[combine_chain.output_key], "source_documents": docs}
+        self.cache.put(query_vector, answer, self.fingerprint)
+        return {"query": query, **answer}
@@ -7,6 +7,9 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.chains import RetrievalQA
 from colorama import Fore, Style, init
 import streamlit as st
+from llm_router import RoutedChatModel
+from notes_generator import router
+from answer_cache import CachedRetrievalQA, get_answer_cache, index_fingerprint
 
 # Environment configuration
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"  # Suppress TensorFlow warnings
@@ -15,9 +18,15 @@ init(autoreset=True)  # Colorama initialization
 # Configuration constants
 EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"
 API_TOKEN = st.secrets["api"]["hugging_face_api"]
+ANSWER_CACHE_THRESHOLD = 0.92  # Cosine similarity for reusing a cached answer
+ANSWER_CACHE_SIZE = 128  # Cached answers per video
 
+# Chatbot questions are short, so they get their own latency SLOs and stats
+# (sharing only rate limits and concurrency slots with notes generation)
+qa_router = router.with_slos({"gemini": 10.0, "phi3": 20.0})
 
-def create_retrieval_qa_pipeline(transcript):
+
+def create_retrieval_qa_pipeline(transcript, video_id=None):
     if not transcript or not isinstance(transcript, str):
         raise ValueError("Transcript must be a non-empty string.")
     
@@ -47,6 +56,8 @@ def create_retrieval_qa_pipeline(transcript):
         max_output_tokens=500,
         temperature=0.3
     )
+    # Gemini with this chain's settings, falling back to Phi-3
+    routed_model = RoutedChatModel(router=qa_router.with_models({"gemini": model}))
 
     prompt_template = """Use the following context to answer:
 {context}
@@ -60,7 +71,7 @@ Answer in clear English:"""  # Simplified template
     )
 
     qa_chain = RetrievalQA.from_chain_type(
-        llm=model,
+        llm=routed_model,
         chain_type="stuff",
         retriever=retriever,
         return_source_documents=True,
@@ -70,7 +81,18 @@ Answer in clear English:"""  # Simplified template
         }
     )
 
-    # Return the QA chain and retriever for chatbot use
-    return qa_chain
+    if video_id is None:
+        return qa_chain
+
+    # Answer repeated questions about this video from the semantic cache
+    fingerprint = index_fingerprint(texts, EMBEDDING_MODEL)
+    cache = get_answer_cache(
+        video_id,
+        fingerprint,
+        threshold=ANSWER_CACHE_THRESHOLD,
+        max_entries=ANSWER_CACHE_SIZE
+    )
+    return CachedRetrievalQA(qa_chain, embeddings, vectorstore, cache, fingerprint,
+                             k=retriever.search_kwargs["k"])
 
 
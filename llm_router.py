@@ -0,0 +1,334 @@
+import copy
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when no provider could be admitted or every admitted provider failed."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to cap the request rate of a single provider.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens the bucket can hold (burst size).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether an exception raised by a chat model means the provider throttled us.
+
+    Args:
+        error (Exception): Exception raised by the provider call.
+
+    Returns:
+        bool: True for HTTP 429 / quota exhaustion errors, otherwise False.
+    """
+    status = (
+        getattr(error, "status_code", None)
+        or getattr(getattr(error, "response", None), "status_code", None)
+        or getattr(error, "code", None)
+    )
+    if status == 429:
+        return True
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "RateLimitError"):
+        return True
+    return "RESOURCE_EXHAUSTED" in str(error)
+
+
+def estimate_tokens(messages) -> int:
+    """Rough token count of chat messages (about four characters per token)."""
+    return sum(len(str(m.content)) for m in messages) // 4 + 1
+
+
+class Provider:
+    """
+    A chat model together with its rate limit, concurrency cap and latency history.
+
+    Args:
+        name (str): Provider name used in logs and errors.
+        model (BaseChatModel): Any LangChain chat model (fake local models work for testing).
+        requests_per_minute (float): Sustained request rate allowed by the token bucket.
+        burst (int): Bucket capacity, i.e. how many requests may be sent back to back.
+        max_concurrency (int): Maximum number of in-flight requests.
+        latency_slo (float): Latency objective in seconds; slower providers are demoted and hedged.
+        cooldown (float): Seconds the provider is tried last after it returns a 429.
+        window (int): Number of recent latencies kept for the rolling percentile.
+        max_age (float): Seconds after which a latency sample expires, so a demoted
+            provider is tried again once its slow samples age out.
+        min_samples (int): Samples needed before the provider can be demoted.
+        max_input_tokens (int, optional): Largest estimated prompt the model can take;
+            bigger requests skip this provider.
+    """
+
+    def __init__(self, name: str, model: BaseChatModel, requests_per_minute: float = 60,
+                 burst: int = 5, max_concurrency: int = 4, latency_slo: float = 30.0,
+                 cooldown: float = 30.0, window: int = 20, max_age: float = 300.0,
+                 min_samples: int = 5, max_input_tokens: Optional[int] = None):
+        self.name = name
+        self.model = model
+        self.latency_slo = latency_slo
+        self.cooldown = cooldown
+        self.max_input_tokens = max_input_tokens
+        self.window = window
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._cooldown_until = [0.0]  # list so copies made by with_model/with_slo share it
+        self._reset_latencies()
+
+    def _reset_latencies(self):
+        self._latencies = deque(maxlen=self.window)  # (recorded at, seconds)
+        self._lock = threading.Lock()
+
+    def with_model(self, model: BaseChatModel) -> "Provider":
+        """Return a provider that uses another model but shares limits and stats with this one."""
+        clone = copy.copy(self)
+        clone.model = model
+        return clone
+
+    def with_slo(self, latency_slo: float) -> "Provider":
+        """
+        Return a provider with its own latency SLO and latency history that still
+        shares the token bucket, concurrency slots and 429 cooldown (all account-wide
+        limits) with this one. Use it for a workload whose latency profile differs,
+        e.g. short chatbot questions vs whole-transcript notes.
+        """
+        clone = copy.copy(self)
+        clone.latency_slo = latency_slo
+        clone._reset_latencies()
+        return clone
+
+    def fits(self, messages) -> bool:
+        return self.max_input_tokens is None or estimate_tokens(messages) <= self.max_input_tokens
+
+    def try_admit(self) -> bool:
+        if not self._slots.acquire(blocking=False):
+            return False
+        if not self.bucket.try_acquire():
+            self._slots.release()
+            return False
+        return True
+
+    def release(self):
+        self._slots.release()
+
+    def record_latency(self, seconds: float):
+        with self._lock:
+            self._latencies.append((time.monotonic(), seconds))
+
+    def record_rate_limit(self):
+        self._cooldown_until[0] = time.monotonic() + self.cooldown
+
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self._cooldown_until[0]
+
+    def _recent_latencies(self) -> list:
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            while self._latencies and self._latencies[0][0] < cutoff:
+                self._latencies.popleft()
+            return [seconds for _, seconds in self._latencies]
+
+    def p95_latency(self) -> float:
+        """Nearest-rank 95th percentile of the unexpired latency samples (0 if none)."""
+        ordered = sorted(self._recent_latencies())
+        if not ordered:
+            return 0.0
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    def within_slo(self) -> bool:
+        if len(self._recent_latencies()) < self.min_samples:
+            return True
+        return self.p95_latency() <= self.latency_slo
+
+
+class LLMRouter:
+    """
+    Routes chat requests across providers with rate limiting, failover and hedging.
+
+    Providers are tried in the given order, except that providers breaching their
+    latency SLO are moved behind healthy ones and providers cooling down after a 429
+    are tried last. If a call has not returned within its provider's SLO, the next
+    provider is started in parallel and the first successful answer wins.
+
+    When every provider is out of tokens or slots, a request waits for one to free
+    up for at most admission_timeout seconds before giving up.
+
+    Args:
+        providers (list[Provider]): Providers in order of preference.
+        max_workers (int): Size of the thread pool used to run (and hedge) calls.
+        admission_timeout (float): Seconds to wait for a token or slot before raising.
+        poll_interval (float): Seconds between admission attempts while waiting.
+    """
+
+    def __init__(self, providers: List[Provider], max_workers: int = 8,
+                 admission_timeout: float = 60.0, poll_interval: float = 0.1):
+        if not providers:
+            raise ValueError("At least one provider is required.")
+        self.providers = providers
+        self.admission_timeout = admission_timeout
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-router")
+
+    def with_models(self, models: dict) -> "LLMRouter":
+        """
+        Return a router whose providers use different models (e.g. other generation
+        settings) while sharing rate limits and latency stats with this router.
+
+        Args:
+            models (dict): Mapping of provider name to replacement chat model.
+        """
+        clone = copy.copy(self)
+        clone.providers = [
+            p.with_model(models[p.name]) if p.name in models else p
+            for p in self.providers
+        ]
+        return clone
+
+    def with_slos(self, latency_slos: dict) -> "LLMRouter":
+        """
+        Return a router with its own latency SLOs and stats that shares token
+        buckets and concurrency slots with this router (see Provider.with_slo).
+
+        Args:
+            latency_slos (dict): Mapping of provider name to latency SLO in seconds.
+        """
+        clone = copy.copy(self)
+        clone.providers = [p.with_slo(latency_slos.get(p.name, p.latency_slo)) for p in self.providers]
+        return clone
+
+    def ranked_providers(self) -> List[Provider]:
+        healthy = [p for p in self.providers if not p.cooling_down() and p.within_slo()]
+        degraded = sorted(
+            (p for p in self.providers if not p.cooling_down() and not p.within_slo()),
+            key=lambda p: p.p95_latency() / p.latency_slo
+        )
+        cooling = [p for p in self.providers if p.cooling_down()]
+        return healthy + degraded + cooling
+
+    def _call(self, provider: Provider, messages, stop, kwargs) -> BaseMessage:
+        start = time.monotonic()
+        try:
+            result = provider.model.invoke(messages, stop=stop, **kwargs)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                provider.record_rate_limit()
+            else:
+                provider.record_latency(time.monotonic() - start)
+            raise
+        else:
+            provider.record_latency(time.monotonic() - start)
+            return result
+        finally:
+            provider.release()
+
+    def _admit_next(self, queue: List[Provider], deadline: Optional[float] = None) -> Optional[Provider]:
+        # Take the best-ranked provider with a free token and slot, waiting until deadline if none has one
+        while True:
+            for provider in queue:
+                if provider.try_admit():
+                    queue.remove(provider)
+                    return provider
+            remaining = 0.0 if deadline is None else deadline - time.monotonic()
+            if not queue or remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+    def invoke(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any) -> BaseMessage:
+        """
+        Send messages to the best available provider.
+
+        Args:
+            messages (list[BaseMessage]): Chat messages to send.
+            stop (list[str], optional): Stop sequences forwarded to the provider.
+
+        Returns:
+            BaseMessage: The first successful provider response.
+
+        Raises:
+            ValueError: If the messages are too large for every provider.
+            RateLimitedError: If every provider stayed throttled or saturated past the
+                admission timeout, or failed.
+        """
+        queue = [p for p in self.ranked_providers() if p.fits(messages)]
+        if not queue:
+            raise ValueError("Input is too large for every provider.")
+        deadline = time.monotonic() + self.admission_timeout
+        pending = {}
+        errors = []
+
+        while queue or pending:
+            if not pending:
+                provider = self._admit_next(queue, deadline)
+                if provider is None:
+                    break
+                pending[self._executor.submit(self._call, provider, messages, stop, kwargs)] = provider
+
+            # Only hedge while there is someone left to hedge with
+            timeout = min(p.latency_slo for p in pending.values()) if queue else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Hedge only if another provider is free right now
+                provider = self._admit_next(queue)
+                if provider is not None:
+                    pending[self._executor.submit(self._call, provider, messages, stop, kwargs)] = provider
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {e}")
+
+        if not errors:
+            raise RateLimitedError("All providers are rate limited or at their concurrency limit.")
+        raise RateLimitedError("All providers failed: " + "; ".join(errors))
+
+
+class RoutedChatModel(BaseChatModel):
+    """
+    LangChain chat model backed by an LLMRouter, so it can be used anywhere a
+    single model is expected (LCEL chains, RetrievalQA, ...).
+    """
+
+    router: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-router"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self.router.invoke(messages, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
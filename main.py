@@ -2,9 +2,7 @@ import streamlit as st
 import transcript_generator
 from notes_generator import chain
 from chatbot import create_retrieval_qa_pipeline
-import os
-import getpass
-from langchain.chat_models import init_chat_model
+from pipeline import TaskGraph
 
 Supadata_api = st.secrets["api"]["Supadata_api"] # transcript generation
 
@@ -91,6 +89,46 @@ with st.container(border = True):
         st.markdown("<br>", unsafe_allow_html=True)
         analyze_btn = st.button("Analyze Video", use_container_width=True)
 
+def render_chatbot():
+    """
+    Displays the chat history and answers new questions with the RetrievalQA chain
+    stored in st.session_state.qa_chain.
+    """
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+    # Display previous messages
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    # Handle user input
+    if prompt := st.chat_input("How may I help you? 😊"):
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        with st.chat_message("assistant"):
+            # Answer from the transcript index
+            with st.spinner("Thinking..."):
+                result = st.session_state.qa_chain.invoke({"query": prompt})
+            response = result["result"]
+            st.markdown(response)
+
+        st.session_state.messages.append({"role": "assistant", "content": response})
+
+    # Semantic answer cache metrics for this video
+    cache = getattr(st.session_state.qa_chain, "cache", None)
+    if cache is not None:
+        stats = cache.stats()
+        st.caption(
+            f"Answer cache: {stats['hits']} of {stats['hits'] + stats['misses']} questions "
+            f"answered from cache ({stats['hit_rate']:.0%} hit rate)"
+        )
+
+
+chat_rendered = False
+
 # Tabs Activation Logic
 if analyze_btn and video_url:
     try:
@@ -177,12 +215,13 @@ if analyze_btn and video_url:
     
                 # API + Local Fallback
                 try:
-                    transcript = transcript_generator.get_youtube_transcript(video_id, Supadata_api)
+                    transcript = transcript_generator.get_youtube_transcript(video_id, Supadata_api,
+                                                                             f"transcripts/{video_id}.seg")
                     st.toast("API transcript fetched successfully", icon="⚡")
                 except Exception as api_error:
                     st.warning(f"API fallback: {str(api_error)}")
                     try:
-                        transcript = transcript_generator.download_and_transcribe(video_url)
+                        transcript = transcript_generator.download_and_transcribe(video_url, f"transcripts/{video_id}.seg")
                         if transcript:
                             st.toast("Local transcription completed", icon="🤖")
                             with open(f"transcripts/{video_id}.txt", "w") as f:
@@ -201,70 +240,56 @@ if analyze_btn and video_url:
                 else:
                     transcript_placeholder.warning("No transcript available")
     
-            # Notes Tab
+            # Notes and chatbot index both need only the transcript, so run them concurrently
             with tabs[1]:
                 st.header("📚 Detailed Notes")
                 notes_placeholder = st.empty()
-    
-                try:    
-                    # Generation and display notes
-                    with st.spinner("Generating notes..."):
-                        notes_result = chain.invoke({"transcript": transcript},
-                                                    config={'run_name': 'SummaryGeneration'})
-                        # notes_placeholder.markdown(notes_result)
-                        notes_placeholder.markdown(
-                            f'<div class="custom-tab-content">{notes_result}</div>',
-                            unsafe_allow_html=True
-                        )
-                
-                except FileNotFoundError:
-                    notes_placeholder.write("Transcript file not found.")
-                except Exception as e:
-                    notes_placeholder.write(f"An error occurred while reading the transcript: {str(e)}")
-    
-    
-            # Chatbot Tab Implementation 
+                notes_placeholder.info("Generating notes...")
+
             with tabs[2]:
                 st.header("🤖 Chatbot")
-    
-                # Get Google API key from secrets or environment
-                api_key = st.secrets.get("GOOGLE_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-                if not api_key:
-                    st.error("Google API key not found. Please add it to Streamlit secrets.")
-                    st.stop()
-                else:
-                    os.environ["GOOGLE_API_KEY"] = api_key  # Set it if not already
-    
-                # Initialize Gemini model
-                client = init_chat_model("gemini-2.0-flash", model_provider="google-genai")
-    
-                if "messages" not in st.session_state:
-                    st.session_state.messages = []
-    
-                # Display previous messages
-                for message in st.session_state.messages:
-                    with st.chat_message(message["role"]):
-                        st.markdown(message["content"])
-    
-                # Handle user input
-                if prompt := st.chat_input("How may I help you? 😊"):
-                    st.session_state.messages.append({"role": "user", "content": prompt})
-                    with st.chat_message("user"):
-                        st.markdown(prompt)
-    
-                    with st.chat_message("assistant"):
-                        # Generate assistant response
-                        stream = client.chat.completions.create(
-                            model="gemini-2.0-flash",  # Specify model name directly
-                            messages=[
-                                {"role": m["role"], "content": m["content"]}
-                                for m in st.session_state.messages
-                            ],
-                            stream=True,
-                        )
-                        response = st.write_stream(stream)
-    
-                    st.session_state.messages.append({"role": "assistant", "content": response})
+                chatbot_placeholder = st.empty()
+                chatbot_placeholder.info("Building chatbot index...")
+
+            with TaskGraph() as graph:
+                graph.add("notes",
+                          lambda transcript: chain.invoke({"transcript": transcript},
+                                                          config={'run_name': 'SummaryGeneration'}),
+                          deps=["transcript"])
+                graph.add("qa_chain", create_retrieval_qa_pipeline, deps=["transcript", "video_id"])
+                futures = graph.run(transcript=transcript, video_id=video_id)
+
+                # Render each tab as soon as its own node finishes
+                for node in graph.as_completed(futures):
+                    error = futures[node].exception()
+
+                    # Notes Tab
+                    if node == "notes":
+                        if error:
+                            notes_placeholder.write(f"An error occurred while generating notes: {str(error)}")
+                        else:
+                            notes_placeholder.markdown(
+                                f'<div class="custom-tab-content">{futures[node].result()}</div>',
+                                unsafe_allow_html=True
+                            )
+
+                    # Chatbot Tab Implementation
+                    elif node == "qa_chain":
+                        if error:
+                            st.session_state.pop("qa_chain", None)
+                            chatbot_placeholder.error(f"Chatbot unavailable: {str(error)}")
+                            continue
+                        chatbot_placeholder.empty()
+
+                        # Keep the index across reruns; start a new conversation for a new video
+                        if st.session_state.get("qa_video_id") != video_id:
+                            st.session_state.messages = []
+                        st.session_state.qa_chain = futures[node].result()
+                        st.session_state.qa_video_id = video_id
+
+                        with tabs[2]:
+                            render_chatbot()
+                        chat_rendered = True
         
     except Exception as e:
         st.error(f"An error occurred: {e}")
@@ -273,3 +298,12 @@ else:
     if not video_url and analyze_btn:
         st.warning("Please enter a valid Youtube URL!")
 
+# Sending a chat message reruns the script with analyze_btn False, so the chatbot
+# for the analysed video is rendered here from session state on those reruns
+if (not chat_rendered
+        and st.session_state.get("qa_chain") is not None
+        and st.session_state.get("qa_video_id") == transcript_generator.extract_video_url(video_url)):
+    with st.container(border=True):
+        st.header("🤖 Chatbot")
+        render_chatbot()
+
@@ -5,6 +5,7 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain.globals import set_llm_cache
 from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
 import streamlit as st
+from llm_router import LLMRouter, Provider, RoutedChatModel
 
 
 # Disables catching
@@ -28,6 +29,16 @@ llm = HuggingFaceEndpoint(
 
 chat = ChatHuggingFace(llm=llm, verbose=True)
 
+# Route requests between Gemini and Phi-3 (rate limits, latency SLOs, failover).
+# Phi-3-mini has a 4k context and 512 new tokens, so it only takes prompts that fit
+# (in practice chatbot questions and very short transcripts).
+router = LLMRouter([
+    Provider("gemini", model, requests_per_minute=15, burst=5, max_concurrency=4, latency_slo=30.0),
+    Provider("phi3", chat, requests_per_minute=30, burst=5, max_concurrency=2, latency_slo=60.0,
+             max_input_tokens=3500),
+])
+routed_model = RoutedChatModel(router=router)
+
 # Design the prompt to denerate notes
 prompt_template = """
 **Input:**  
@@ -60,4 +71,4 @@ prompt = PromptTemplate(
 parser = StrOutputParser()
 
 # Form chain
-chain = prompt | model | parser
\ No newline at end of file
+chain = prompt | routed_model | parser
\ No newline at end of file
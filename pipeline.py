@@ -0,0 +1,133 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+
+class TaskGraph:
+    """
+    Small dependency-graph executor for the per-video pipeline.
+
+    Each node is a function whose keyword arguments are the results of the nodes
+    it depends on. A node is submitted as soon as its last dependency finishes, so
+    independent branches (e.g. notes generation and index building) run
+    concurrently and the total latency is that of the slowest branch.
+
+    Args:
+        max_workers (int): Number of worker threads.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+        self._nodes = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._executor.shutdown(wait=True)
+
+    def add(self, name: str, fn, deps=()):
+        """
+        Registers a node.
+
+        Args:
+            name (str): Node name, also the keyword its result is passed as to dependents.
+            fn (callable): Function called with the results of deps as keyword arguments.
+            deps (iterable[str]): Names of nodes or run() inputs this node needs.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Node '{name}' is already defined.")
+        self._nodes[name] = (fn, tuple(dict.fromkeys(deps)))
+
+    def run(self, **inputs) -> dict:
+        """
+        Starts every node whose dependencies are satisfied and returns immediately.
+
+        Args:
+            **inputs: Values available up front (e.g. transcript=...).
+
+        Returns:
+            dict[str, Future]: A future per node and per input.
+
+        Raises:
+            ValueError: If a node depends on an unknown node or the graph has a cycle.
+        """
+        futures = {name: Future() for name in list(inputs) + list(self._nodes)}
+        for name, value in inputs.items():
+            futures[name].set_result(value)
+
+        for name, (fn, deps) in self._nodes.items():
+            missing = [d for d in deps if d not in futures]
+            if missing:
+                raise ValueError(f"Node '{name}' depends on unknown nodes: {missing}")
+        self._check_acyclic(inputs)
+
+        remaining = {name: len(deps) for name, (fn, deps) in self._nodes.items()}
+        roots = [name for name, count in remaining.items() if count == 0]
+
+        def start(name):
+            fn, deps = self._nodes[name]
+            for d in deps:
+                if futures[d].exception() is not None:
+                    futures[name].set_exception(
+                        RuntimeError(f"Dependency '{d}' of '{name}' failed: {futures[d].exception()}")
+                    )
+                    return
+            kwargs = {d: futures[d].result() for d in deps}
+            task = self._executor.submit(fn, **kwargs)
+            task.add_done_callback(lambda t: _copy_result(t, futures[name]))
+
+        def on_done(dep):
+            ready = []
+            with self._lock:
+                for name, (fn, deps) in self._nodes.items():
+                    if dep in deps:
+                        remaining[name] -= 1
+                        if remaining[name] == 0:
+                            ready.append(name)
+            for name in ready:
+                start(name)
+
+        for name in futures:
+            futures[name].add_done_callback(lambda f, name=name: on_done(name))
+        for name in roots:
+            start(name)
+        return futures
+
+    def _check_acyclic(self, inputs):
+        # Topological sort pass: nodes left over are on (or behind) a cycle and would never start
+        remaining = {
+            name: sum(1 for d in deps if d not in inputs)
+            for name, (fn, deps) in self._nodes.items()
+        }
+        ready = [name for name, count in remaining.items() if count == 0]
+        while ready:
+            done = ready.pop()
+            for name, (fn, deps) in self._nodes.items():
+                if done in deps:
+                    remaining[name] -= 1
+                    if remaining[name] == 0:
+                        ready.append(name)
+        stuck = [name for name, count in remaining.items() if count > 0]
+        if stuck:
+            raise ValueError(f"Dependency cycle between nodes: {stuck}")
+
+    def as_completed(self, futures: dict, names=None):
+        """
+        Yields node names in the order they finish.
+
+        Args:
+            futures (dict[str, Future]): Mapping returned by run().
+            names (iterable[str], optional): Nodes to wait for; defaults to every node.
+        """
+        names = list(self._nodes) if names is None else list(names)
+        by_future = {futures[name]: name for name in names}
+        for future in as_completed(by_future):
+            yield by_future[future]
+
+
+def _copy_result(source: Future, target: Future):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
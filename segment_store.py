@@ -0,0 +1,166 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+# File layout (native byte order):
+#   header  : magic, version, segment count            (16 bytes)
+#   starts  : n x float64 segment start times (seconds)
+#   ends    : n x float64 segment end times (seconds)
+#   max_ends: n x float64 running maximum of ends, so range lookups stay correct
+#             even when Whisper emits overlapping or non-monotonic timestamps
+#   offsets : (n + 1) x uint64 byte offsets into the text blob
+#   blob    : UTF-8 text of all segments, back to back
+MAGIC = b"NVSG"
+VERSION = 2
+HEADER = struct.Struct("=4sIQ")
+
+
+def write_segment_store(path: str, segments) -> int:
+    """
+    Writes transcript segments to a compact, memory-mappable segment store.
+
+    Args:
+        path (str): Destination file (e.g. 'transcripts/<video_id>.seg').
+        segments (iterable): Whisper-style segments, dicts with 'start', 'end' and 'text'.
+
+    Returns:
+        int: Number of segments written.
+    """
+    segments = sorted(segments, key=lambda s: s["start"])
+    starts = array("d", (float(s["start"]) for s in segments))
+    ends = array("d", (float(s["end"]) for s in segments))
+    max_ends = array("d")
+    for end in ends:
+        max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for s in segments:
+        blob += s["text"].strip().encode("utf-8")
+        offsets.append(len(blob))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(segments)))
+        f.write(starts.tobytes())
+        f.write(ends.tobytes())
+        f.write(max_ends.tobytes())
+        f.write(offsets.tobytes())
+        f.write(blob)
+    return len(segments)
+
+
+class SegmentStore:
+    """
+    Read-only view over a segment store file, memory-mapped so only the pages
+    touched by a lookup are loaded.
+
+    Args:
+        path (str): Path of a file written by write_segment_store.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = None
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, n = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a segment store file: {path}")
+            if len(self._mm) < HEADER.size + 8 * (4 * n + 1):
+                raise ValueError(f"Truncated segment store file: {path}")
+
+            view = memoryview(self._mm)
+            pos = HEADER.size
+            self.starts = view[pos:pos + 8 * n].cast("d")
+            pos += 8 * n
+            self.ends = view[pos:pos + 8 * n].cast("d")
+            pos += 8 * n
+            self.max_ends = view[pos:pos + 8 * n].cast("d")
+            pos += 8 * n
+            self.offsets = view[pos:pos + 8 * (n + 1)].cast("Q")
+            pos += 8 * (n + 1)
+            self._blob_start = pos
+        except BaseException:
+            # Don't leak the file handle (or the mapping) on any failure
+            self.close()
+            raise
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for name in ("starts", "ends", "max_ends", "offsets"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def _text(self, first: int, last: int) -> str:
+        begin = self._blob_start + self.offsets[first]
+        end = self._blob_start + self.offsets[last]
+        return self._mm[begin:end].decode("utf-8")
+
+    def segment(self, index: int) -> tuple:
+        """Returns (start, end, text) of the segment at index."""
+        return self.starts[index], self.ends[index], self._text(index, index + 1)
+
+    def index_at(self, timestamp: float) -> int | None:
+        """
+        Finds the segment playing at a timestamp in O(log n) (plus a short walk back
+        when segments overlap).
+
+        Args:
+            timestamp (float): Position in the video, in seconds.
+
+        Returns:
+            int | None: Index of the latest-starting segment covering the timestamp, or
+            None if the timestamp falls outside every segment.
+        """
+        index = bisect_right(self.starts, timestamp) - 1
+        # Earlier segments can only cover the timestamp while their running max end does
+        while index >= 0 and timestamp < self.max_ends[index]:
+            if timestamp < self.ends[index]:
+                return index
+            index -= 1
+        return None
+
+    def text_at(self, timestamp: float) -> str | None:
+        """Returns the text spoken at a timestamp, or None."""
+        index = self.index_at(timestamp)
+        return None if index is None else self._text(index, index + 1)
+
+    def range_indices(self, start: float, end: float) -> list:
+        """Returns the indices of segments overlapping the [start, end) time range."""
+        # max_ends is sorted even when ends are not; skip the few segments inside the
+        # candidate range that still end before start
+        first = bisect_right(self.max_ends, start)
+        last = bisect_left(self.starts, end)
+        return [i for i in range(first, last) if self.ends[i] > start]
+
+    def slice(self, start: float, end: float) -> list:
+        """
+        Returns the segments overlapping a time range.
+
+        Args:
+            start (float): Range start, in seconds.
+            end (float): Range end, in seconds.
+
+        Returns:
+            list[tuple]: (start, end, text) tuples in time order.
+        """
+        return [self.segment(i) for i in self.range_indices(start, end)]
+
+    def text_between(self, start: float, end: float, sep: str = " ") -> str:
+        """Returns the transcript text spoken between start and end, joined with sep."""
+        indices = self.range_indices(start, end)
+        return sep.join(self._text(i, i + 1) for i in indices)
@@ -0,0 +1,128 @@
+import pytest
+
+from answer_cache import (
+    CachedRetrievalQA,
+    SemanticAnswerCache,
+    get_answer_cache,
+    index_fingerprint,
+)
+
+VECTORS = {
+    "what is a token bucket": [1.0, 0.0, 0.0],
+    "what's a token bucket?": [0.99, 0.1, 0.0],
+    "who gave the lecture": [0.0, 1.0, 0.0],
+}
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return VECTORS[text]
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.searches = []
+
+    def similarity_search_by_vector(self, vector, k=4):
+        self.searches.append((vector, k))
+        return [f"doc{i}" for i in range(k)]
+
+
+class FakeCombineChain:
+    output_key = "output_text"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return {"output_text": f"answer to {inputs['question']}"}
+
+
+class FakeQAChain:
+    def __init__(self):
+        self.combine_documents_chain = FakeCombineChain()
+
+
+@pytest.fixture
+def qa():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=2, fingerprint="index-1")
+    return CachedRetrievalQA(FakeQAChain(), FakeEmbeddings(), FakeVectorStore(), cache, "index-1", k=3)
+
+
+def test_miss_embeds_once_and_searches_by_vector(qa):
+    result = qa.invoke({"query": "what is a token bucket"})
+
+    assert result == {
+        "query": "what is a token bucket",
+        "result": "answer to what is a token bucket",
+        "source_documents": ["doc0", "doc1", "doc2"],
+    }
+    assert qa.embeddings.calls == 1
+    assert qa.vectorstore.searches == [(VECTORS["what is a token bucket"], 3)]
+
+
+def test_similar_question_hits(qa):
+    qa.invoke({"query": "what is a token bucket"})
+    result = qa.invoke({"query": "what's a token bucket?"})
+
+    assert result["query"] == "what's a token bucket?"
+    assert result["result"] == "answer to what is a token bucket"
+    assert qa.qa_chain.combine_documents_chain.calls == 1
+    assert qa.cache.stats()["hit_rate"] == 0.5
+
+
+def test_different_question_misses(qa):
+    qa.invoke({"query": "what is a token bucket"})
+    qa.invoke({"query": "who gave the lecture"})
+
+    assert qa.qa_chain.combine_documents_chain.calls == 2
+    assert qa.cache.stats()["misses"] == 2
+
+
+def test_lru_eviction():
+    cache = SemanticAnswerCache(threshold=0.99, max_entries=2)
+    cache.put([1, 0, 0], "a")
+    cache.put([0, 1, 0], "b")
+    assert cache.get([1, 0, 0]) == "a"  # a is now most recently used
+    cache.put([0, 0, 1], "c")
+
+    assert cache.get([0, 1, 0]) is None
+    assert cache.get([1, 0, 0]) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_index_change_invalidates_video_cache():
+    model = "fake-model"
+    cache = get_answer_cache("vid-test", index_fingerprint(["chunk 1"], model))
+    cache.put([1, 0, 0], "a")
+
+    same = get_answer_cache("vid-test", index_fingerprint(["chunk 1"], model))
+    assert same is cache and len(cache) == 1
+
+    get_answer_cache("vid-test", index_fingerprint(["chunk 1", "chunk 2"], model))
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_stale_chain_cannot_read_or_write_after_invalidation(qa):
+    qa.invoke({"query": "what is a token bucket"})
+
+    # Another session rebuilt the index from a different transcript
+    fresh = CachedRetrievalQA(FakeQAChain(), FakeEmbeddings(), FakeVectorStore(), qa.cache, "index-2", k=3)
+    qa.cache.ensure_fingerprint("index-2")
+    assert len(qa.cache) == 0
+
+    # The stale chain misses and does not store its old-index answer
+    qa.invoke({"query": "what is a token bucket"})
+    assert qa.qa_chain.combine_documents_chain.calls == 2
+    assert len(qa.cache) == 0
+
+    fresh.invoke({"query": "what is a token bucket"})
+    assert len(qa.cache) == 1
+    assert fresh.invoke({"query": "what's a token bucket?"})["result"] == "answer to what is a token bucket"
+    assert fresh.qa_chain.combine_documents_chain.calls == 1
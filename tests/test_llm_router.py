@@ -0,0 +1,177 @@
+import itertools
+import time
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from llm_router import (
+    LLMRouter,
+    Provider,
+    RateLimitedError,
+    RoutedChatModel,
+    is_rate_limit_error,
+)
+
+MESSAGES = [HumanMessage("What is a token bucket?")]
+
+
+class FakeChat(GenericFakeChatModel):
+    """Fake chat model that can be slow or fail."""
+
+    delay: float = 0.0
+    error: Any = None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def fake(reply, **kwargs):
+    return FakeChat(messages=itertools.repeat(AIMessage(reply)), **kwargs)
+
+
+class TooManyRequests(Exception):
+    status_code = 429
+
+
+def test_uses_first_provider():
+    router = LLMRouter([Provider("a", fake("A")), Provider("b", fake("B"))])
+    assert router.invoke(MESSAGES).content == "A"
+
+
+def test_fails_over_on_error():
+    router = LLMRouter([
+        Provider("a", fake("A", error=RuntimeError("boom"))),
+        Provider("b", fake("B")),
+    ])
+    assert router.invoke(MESSAGES).content == "B"
+
+
+def test_raises_when_every_provider_fails():
+    router = LLMRouter([
+        Provider("a", fake("A", error=RuntimeError("boom"))),
+        Provider("b", fake("B", error=RuntimeError("bang"))),
+    ])
+    with pytest.raises(RateLimitedError, match="a: boom; b: bang"):
+        router.invoke(MESSAGES)
+
+
+def test_rate_limit_puts_provider_last():
+    a = Provider("a", fake("A", error=TooManyRequests("quota")))
+    b = Provider("b", fake("B"))
+    router = LLMRouter([a, b])
+
+    assert router.invoke(MESSAGES).content == "B"
+    assert a.cooling_down()
+    assert [p.name for p in router.ranked_providers()] == ["b", "a"]
+
+
+def test_hedges_provider_slower_than_slo():
+    router = LLMRouter([
+        Provider("a", fake("A", delay=1.0), latency_slo=0.1),
+        Provider("b", fake("B")),
+    ])
+    start = time.monotonic()
+    assert router.invoke(MESSAGES).content == "B"
+    assert time.monotonic() - start < 0.8
+
+
+def test_slo_breach_demotes_provider():
+    a = Provider("a", fake("A"), latency_slo=1.0, min_samples=3)
+    b = Provider("b", fake("B"), latency_slo=1.0)
+    router = LLMRouter([a, b])
+    a.record_latency(5.0)
+    a.record_latency(5.0)
+    assert [p.name for p in router.ranked_providers()] == ["a", "b"]  # too few samples
+
+    a.record_latency(5.0)
+    assert [p.name for p in router.ranked_providers()] == ["b", "a"]
+    assert router.invoke(MESSAGES).content == "B"
+
+
+def test_single_outlier_does_not_demote():
+    a = Provider("a", fake("A"), latency_slo=10.0)
+    for _ in range(19):
+        a.record_latency(0.1)
+    a.record_latency(11.0)
+
+    assert a.p95_latency() == 0.1
+    assert a.within_slo()
+
+
+def test_demoted_provider_recovers_when_samples_expire():
+    a = Provider("a", fake("A"), latency_slo=1.0, min_samples=1, max_age=0.2)
+    router = LLMRouter([a, Provider("b", fake("B"))])
+    a.record_latency(5.0)
+    assert router.invoke(MESSAGES).content == "B"
+
+    time.sleep(0.3)
+    assert a.within_slo()
+    assert router.invoke(MESSAGES).content == "A"
+
+
+def test_admission_waits_for_token():
+    router = LLMRouter([Provider("a", fake("A"), requests_per_minute=600, burst=1)])
+    router.invoke(MESSAGES)
+
+    start = time.monotonic()
+    assert router.invoke(MESSAGES).content == "A"
+    assert time.monotonic() - start >= 0.05
+
+
+def test_admission_gives_up_after_timeout():
+    router = LLMRouter([Provider("a", fake("A"), requests_per_minute=1, burst=1)],
+                       admission_timeout=0.2)
+    router.invoke(MESSAGES)
+
+    with pytest.raises(RateLimitedError, match="rate limited"):
+        router.invoke(MESSAGES)
+
+
+def test_skips_provider_when_input_too_large():
+    router = LLMRouter([
+        Provider("small", fake("S"), max_input_tokens=2),
+        Provider("big", fake("B")),
+    ])
+    assert router.invoke(MESSAGES).content == "B"
+
+    with pytest.raises(ValueError):
+        LLMRouter([Provider("small", fake("S"), max_input_tokens=2)]).invoke(MESSAGES)
+
+
+def test_with_slos_shares_limits_and_cooldown_but_not_latencies():
+    notes = LLMRouter([Provider("a", fake("A"), burst=1, requests_per_minute=1)],
+                      admission_timeout=0.1)
+    chat = notes.with_slos({"a": 5.0})
+    notes.providers[0].record_latency(100.0)
+
+    assert chat.providers[0].latency_slo == 5.0
+    assert chat.providers[0].p95_latency() == 0.0
+    assert chat.providers[0].bucket is notes.providers[0].bucket
+
+    # A 429 is an account-wide quota limit, so it cools down both workloads
+    chat.providers[0].record_rate_limit()
+    assert notes.providers[0].cooling_down()
+
+    notes.invoke(MESSAGES)
+    with pytest.raises(RateLimitedError):
+        chat.invoke(MESSAGES)
+
+
+@pytest.mark.parametrize("error, expected", [
+    (TooManyRequests("slow down"), True),
+    (RuntimeError("429 RESOURCE_EXHAUSTED"), True),
+    (RuntimeError("prompt used 4290 tokens"), False),
+    (RuntimeError("request 1429 failed"), False),
+])
+def test_is_rate_limit_error(error, expected):
+    assert is_rate_limit_error(error) is expected
+
+
+def test_routed_chat_model():
+    model = RoutedChatModel(router=LLMRouter([Provider("a", fake("A"))]))
+    assert model.invoke("hello").content == "A"
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from pipeline import TaskGraph
+
+
+def test_independent_branches_run_concurrently():
+    with TaskGraph() as graph:
+        graph.add("notes", lambda transcript: (time.sleep(0.3), transcript + " notes")[1], deps=["transcript"])
+        graph.add("index", lambda transcript: (time.sleep(0.3), transcript + " index")[1], deps=["transcript"])
+        graph.add("both", lambda notes, index: [notes, index], deps=["notes", "index"])
+
+        start = time.monotonic()
+        futures = graph.run(transcript="T")
+        order = list(graph.as_completed(futures))
+        elapsed = time.monotonic() - start
+
+    assert order[-1] == "both"
+    assert futures["both"].result() == ["T notes", "T index"]
+    assert elapsed < 0.55
+
+
+def test_failure_propagates_to_dependents():
+    with TaskGraph() as graph:
+        graph.add("bad", lambda: 1 / 0)
+        graph.add("after", lambda bad: bad, deps=["bad"])
+        futures = graph.run()
+        list(graph.as_completed(futures))
+
+    assert isinstance(futures["bad"].exception(), ZeroDivisionError)
+    assert "Dependency 'bad'" in str(futures["after"].exception())
+
+
+def test_unknown_dependency_is_rejected():
+    with TaskGraph() as graph:
+        graph.add("notes", lambda transcript: transcript, deps=["transcript"])
+        with pytest.raises(ValueError, match="unknown"):
+            graph.run()
+
+
+def test_cycle_is_rejected():
+    with TaskGraph() as graph:
+        graph.add("a", lambda c: c, deps=["c"])
+        graph.add("b", lambda a: a, deps=["a"])
+        graph.add("c", lambda b: b, deps=["b"])
+        graph.add("ok", lambda transcript: transcript, deps=["transcript"])
+        with pytest.raises(ValueError, match="cycle"):
+            graph.run(transcript="T")
@@ -0,0 +1,88 @@
+import pytest
+
+from segment_store import SegmentStore, write_segment_store
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": " Welcome to the lecture."},
+    {"start": 2.5, "end": 6.0, "text": " Today: token buckets."},
+    {"start": 8.0, "end": 9.5, "text": " Questions? ¿Sí?"},
+]
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "transcripts" / "video.seg"
+    assert write_segment_store(str(path), SEGMENTS) == 3
+    return str(path)
+
+
+def test_text_at(store_path):
+    with SegmentStore(store_path) as store:
+        assert len(store) == 3
+        assert store.text_at(0.0) == "Welcome to the lecture."
+        assert store.text_at(5.9) == "Today: token buckets."
+        assert store.text_at(7.0) is None
+        assert store.text_at(9.0) == "Questions? ¿Sí?"
+        assert store.text_at(20.0) is None
+
+
+def test_slice_and_text_between(store_path):
+    with SegmentStore(store_path) as store:
+        assert store.slice(2.0, 8.5) == [
+            (0.0, 2.5, "Welcome to the lecture."),
+            (2.5, 6.0, "Today: token buckets."),
+            (8.0, 9.5, "Questions? ¿Sí?"),
+        ]
+        assert store.slice(6.0, 8.0) == []
+        assert store.text_between(3.0, 10.0) == "Today: token buckets. Questions? ¿Sí?"
+
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "empty.seg")
+    write_segment_store(path, [])
+    with SegmentStore(path) as store:
+        assert len(store) == 0
+        assert store.text_at(1.0) is None
+
+
+@pytest.mark.parametrize("content", [b"", b"NVSG", b"XXXX" + bytes(12)])
+def test_invalid_file_closes_handle(tmp_path, monkeypatch, content):
+    path = tmp_path / "bad.seg"
+    path.write_bytes(content)
+
+    opened = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    with pytest.raises(Exception):
+        SegmentStore(str(path))
+    assert opened and all(f.closed for f in opened)
+
+
+def test_truncated_file(store_path, tmp_path):
+    path = tmp_path / "truncated.seg"
+    with open(store_path, "rb") as f:
+        path.write_bytes(f.read()[:40])
+    with pytest.raises(ValueError, match="Truncated"):
+        SegmentStore(str(path))
+
+
+def test_overlapping_segments(tmp_path):
+    path = str(tmp_path / "overlap.seg")
+    write_segment_store(path, [
+        {"start": 0.0, "end": 10.0, "text": "long"},
+        {"start": 5.0, "end": 6.0, "text": "inner"},
+        {"start": 7.0, "end": 12.0, "text": "late"},
+    ])
+    with SegmentStore(path) as store:
+        assert [text for _, _, text in store.slice(8.0, 9.0)] == ["long", "late"]
+        assert [text for _, _, text in store.slice(6.0, 6.5)] == ["long"]
+        assert store.text_at(6.5) == "long"
+        assert store.text_at(5.5) == "inner"
+        assert store.text_at(11.0) == "late"
+        assert store.text_at(12.5) is None
@@ -8,6 +8,7 @@ from urllib.parse import urlparse, parse_qs
 import streamlit as st
 import requests
 import tempfile
+from segment_store import write_segment_store
 
 
 def is_valid_youtube_url(url):
@@ -122,13 +123,14 @@ def verify_youtube_url(url: str):
 
 
 
-def get_youtube_transcript(video_id: str, api_key: str) -> str:
+def get_youtube_transcript(video_id: str, api_key: str, segments_path: str | None = None) -> str:
     """
     Fetches YouTube transcript in paragraph format using Supadata API
     
     Args:
         video_id: YouTube video ID (e.g., 'dQw4w9WgXcQ')
         api_key: Your Supadata API key
+        segments_path: If given, the timed chunks are saved there as a segment store
         
     Returns:
         str: Plain text transcript in paragraph format
@@ -139,7 +141,7 @@ def get_youtube_transcript(video_id: str, api_key: str) -> str:
     url = "https://api.supadata.ai/v1/youtube/transcript"
     params = {
         "videoId": video_id,
-        "text": "true"
+        "text": "false"  # Timed chunks, so segment timings are kept
     }
     headers = {
         "x-api-key": api_key
@@ -148,7 +150,37 @@ def get_youtube_transcript(video_id: str, api_key: str) -> str:
     response = requests.get(url, params=params, headers=headers)
     response.raise_for_status()
     
-    return response.json()["content"]
+    content = response.json()["content"]
+    if isinstance(content, str):
+        return content
+
+    # Chunk offsets and durations are in milliseconds
+    if segments_path:
+        save_segment_store(segments_path, [
+            {
+                "start": chunk["offset"] / 1000,
+                "end": (chunk["offset"] + chunk.get("duration", 0)) / 1000,
+                "text": chunk["text"],
+            }
+            for chunk in content
+        ])
+    return " ".join(chunk["text"].strip() for chunk in content)
+
+
+
+def save_segment_store(segments_path: str, segments) -> None:
+    """
+    Saves transcript segments as a segment store, only warning on failure since the
+    store is optional and must never cost us the transcript itself.
+
+    Args:
+        segments_path (str): Destination file (e.g. 'transcripts/<video_id>.seg')
+        segments (list[dict]): Segments with 'start', 'end' (seconds) and 'text'
+    """
+    try:
+        write_segment_store(segments_path, segments)
+    except Exception as e:
+        st.warning(f"Saving segment timings failed: {str(e)}")
 
 
 
@@ -218,12 +250,14 @@ def wait_for_download(file_path, timeout=100):
 
 
 
-def transcribe_video(video_path: str) -> str:
+def transcribe_video(video_path: str, segments_path: str | None = None) -> str:
     """
     Transcribes a video file using Whisper and returns only the transcript text.
     
     Args:
         video_path (str): Path to the video/audio file
+        segments_path (str, optional): If given, Whisper's segment timings are saved
+            there as a segment store (see segment_store.py)
         
     Returns:
         str: Raw transcribed text or None if error occurs
@@ -231,21 +265,26 @@ def transcribe_video(video_path: str) -> str:
     try:
         model = whisper.load_model('base')
         result = model.transcribe(video_path)
-        return result.get('text', '')
     
     except Exception as e:
         st.error(f"Transcription failed: {str(e)}")
         return None
 
+    if segments_path:
+        save_segment_store(segments_path, result.get('segments', []))
+
+    return result.get('text', '')
+
 
 
 
-def download_and_transcribe(video_url: str) -> str | None:
+def download_and_transcribe(video_url: str, segments_path: str | None = None) -> str | None:
     """
     Downloads a YouTube video and transcribes its audio content with proper error handling.
 
     Args:
         video_url (str): Valid YouTube video URL
+        segments_path (str, optional): Where to save the timestamped segment store
 
     Returns:
         str | None: Transcript text or None if failed
@@ -262,7 +301,7 @@ def download_and_transcribe(video_url: str) -> str | None:
             return None
 
         # Transcribe audio content
-        transcript = transcribe_video(video_path)
+        transcript = transcribe_video(video_path, segments_path)
         
         # Cleanup temporary files immediately
         try:
@@ -297,14 +336,14 @@ def display_transcript(tabs, video_id: str, video_url: str, api_key: str):
 
         # Try API method first
         try:
-            transcript = get_youtube_transcript(video_id, api_key)
+            transcript = get_youtube_transcript(video_id, api_key, f"transcripts/{video_id}.seg")
             st.toast("API transcript fetched successfully", icon="⚡")
         except Exception as api_error:
             st.warning(f"API fallback: {str(api_error)}")
             
             # Fallback to local processing
             try:
-                transcript = download_and_transcribe(video_url)
+                transcript = download_and_transcribe(video_url, f"transcripts/{video_id}.seg")
                 if transcript:
                     st.toast("Local transcription completed", icon="🤖")
                     